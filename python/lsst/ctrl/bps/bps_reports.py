@@ -31,14 +31,37 @@
 __all__ = ["BaseRunReport", "DetailedRunReport", "SummaryRunReport", "ExitCodesReport", "compile_job_summary"]
 
 import abc
+import functools
 import logging
+from collections import Counter
+from operator import attrgetter
+from types import MappingProxyType
 
-from astropy.table import Table
+import numpy as np
+from astropy.table import MaskedColumn, Table
 
 from .wms_service import WmsRunReport, WmsStates
 
 _LOG = logging.getLogger(__name__)
 
+_WMS_STATES = tuple(WmsStates)
+"""All run and job states in their definition order (`tuple`)."""
+
+_UNREADY_INDEX = _WMS_STATES.index(WmsStates.UNREADY)
+"""Position of the UNREADY state in `_WMS_STATES` (`int`)."""
+
+_MISSING_COUNTS = (-1,) * len(_WMS_STATES)
+"""Per-state job counts reported for labels missing from a job summary
+(`tuple` [`int`]).
+"""
+
+_SUMMARY_ATTRS = attrgetter("state", "job_state_counts", "total_number_jobs")
+"""Getter of the run attributes the summary report entries are derived from.
+"""
+
+_SUMMARY_DESCRIPTION_ATTRS = attrgetter("operator", "project", "campaign", "payload", "run")
+"""Getter of the run attributes the summary report shows as is."""
+
 
 class BaseRunReport(abc.ABC):
     """The base class representing a run report.
@@ -52,20 +75,25 @@ class BaseRunReport(abc.ABC):
 
     def __init__(self, fields):
         self._table = Table(dtype=fields)
+        self._colnames = frozenset(self._table.colnames)
         self._msg = None
 
     def __eq__(self, other):
-        if isinstance(other, BaseRunReport):
-            return all(self._table == other._table)
-        return False
+        if not isinstance(other, BaseRunReport):
+            return False
+        # Rule out mismatches which are cheap to detect before comparing
+        # the entries column by column.
+        table, other_table = self._table, other._table
+        if len(table) != len(other_table) or table.colnames != other_table.colnames:
+            return False
+        return all(np.array_equal(table[name], other_table[name]) for name in table.colnames)
 
     def __len__(self):
         """Return the number of runs in the report."""
         return len(self._table)
 
     def __str__(self):
-        lines = list(self._table.pformat_all())
-        return "\n".join(lines)
+        return "\n".join(self._table.pformat_all())
 
     @property
     def message(self):
@@ -75,7 +103,7 @@ class BaseRunReport(abc.ABC):
     def clear(self):
         """Remove all entries from the report."""
         self._msg = None
-        self._table.remove_rows(slice(len(self)))
+        self._table = self._table[:0].copy()
 
     def sort(self, columns, ascending=True):
         """Sort the report entries according to one or more keys.
@@ -94,13 +122,57 @@ class BaseRunReport(abc.ABC):
         """
         if isinstance(columns, str):
             columns = [columns]
-        unknown_keys = set(columns) - set(self._table.colnames)
+        unknown_keys = [column for column in columns if column not in self._colnames]
         if unknown_keys:
             raise AttributeError(
                 f"cannot sort the report entries: column(s) {', '.join(unknown_keys)} not found"
             )
         self._table.sort(keys=columns, reverse=not ascending)
 
+    def _add_rows(self, rows):
+        """Append multiple rows to the report at once.
+
+        Parameters
+        ----------
+        rows : `list` [`tuple`]
+            Rows to add. Each row must list values in the column order.
+        """
+        if rows:
+            self._add_columns(list(zip(*rows, strict=True)))
+
+    def _add_columns(self, columns):
+        """Append multiple rows, given column by column, to the report.
+
+        Adding rows one by one with ``Table.add_row`` reallocates every
+        column on each insertion. Here each column is allocated only once,
+        at its final length, and then filled with the existing and the new
+        values.
+
+        Parameters
+        ----------
+        columns : `list` [`~collections.abc.Sequence`]
+            Values to add to each column, listed in the column order. All
+            sequences must have the same length.
+        """
+        size = len(self._table)
+        new_columns = []
+        for column, values in zip(self._table.itercols(), columns, strict=True):
+            # Let the width of string columns be determined by the new values
+            # so they can be widened if needed.
+            kind = column.dtype.kind
+            values = np.asarray(values, dtype=kind if kind in "SU" else column.dtype)
+            data = np.empty(size + len(values), dtype=np.promote_types(column.dtype, values.dtype))
+            data[:size] = column
+            data[size:] = values
+            if isinstance(column, MaskedColumn):
+                # Keep the existing mask, the new entries are not masked.
+                mask = np.zeros(len(data), dtype=bool)
+                mask[:size] = np.ma.getmaskarray(column)
+                data = np.ma.MaskedArray(data, mask=mask)
+            # Copy the column attributes (e.g. format, unit, description).
+            new_columns.append(column.copy(data=data, copy_data=False))
+        self._table = Table(new_columns, names=self._table.colnames, meta=self._table.meta, copy=False)
+
     @classmethod
     def from_table(cls, table):
         """Create a report from a table.
@@ -135,44 +207,81 @@ class BaseRunReport(abc.ABC):
             queues (e.g., HTCondor).
         """
 
+    def add_many(self, run_reports, use_global_id=False):
+        """Add information about multiple runs to the report.
+
+        Parameters
+        ----------
+        run_reports : `list` [`lsst.ctrl.bps.WmsRunReport`]
+            Information about the runs.
+        use_global_id : `bool`, optional
+            If set, use global run id. Defaults to False which means that
+            the local id will be used instead.
+
+            Only applicable in the context of a WMS using distributed job
+            queues (e.g., HTCondor).
+        """
+        for run_report in run_reports:
+            self.add(run_report, use_global_id=use_global_id)
+
 
 class SummaryRunReport(BaseRunReport):
     """A summary run report."""
 
     def add(self, run_report, use_global_id=False):
         # Docstring inherited from the base class.
+        self._add_rows([self._make_row(run_report, use_global_id=use_global_id)])
+
+    def add_many(self, run_reports, use_global_id=False):
+        # Docstring inherited from the base class.
+        self._add_rows([self._make_row(report, use_global_id=use_global_id) for report in run_reports])
+
+    def _make_row(self, run_report, use_global_id=False):
+        """Create a report entry for a single run.
+
+        Parameters
+        ----------
+        run_report : `lsst.ctrl.bps.WmsRunReport`
+            Information for single run.
+        use_global_id : `bool`, optional
+            If set, use global run id. Defaults to False which means that
+            the local id will be used instead.
+
+        Returns
+        -------
+        row : `tuple`
+            Values of the report columns for the run.
+        """
+        state, job_state_counts, total_number_jobs = _SUMMARY_ATTRS(run_report)
 
         # Flag any running workflow that might need human attention.
         run_flag = " "
-        if run_report.state == WmsStates.RUNNING:
-            if run_report.job_state_counts.get(WmsStates.HELD, 0):
+        if state == WmsStates.RUNNING:
+            if job_state_counts.get(WmsStates.HELD, 0):
                 run_flag = "H"
-            elif run_report.job_state_counts.get(WmsStates.DELETED, 0):
+            elif job_state_counts.get(WmsStates.DELETED, 0):
                 run_flag = "D"
-            elif run_report.job_state_counts.get(WmsStates.FAILED, 0):
+            elif job_state_counts.get(WmsStates.FAILED, 0):
                 run_flag = "F"
 
         # Estimate success rate.
         percent_succeeded = "UNK"
-        _LOG.debug("total_number_jobs = %s", run_report.total_number_jobs)
-        _LOG.debug("run_report.job_state_counts = %s", run_report.job_state_counts)
-        if run_report.total_number_jobs:
-            succeeded = run_report.job_state_counts.get(WmsStates.SUCCEEDED, 0)
-            _LOG.debug("succeeded = %s", succeeded)
-            percent_succeeded = f"{int(succeeded / run_report.total_number_jobs * 100)}"
-
-        row = (
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("total_number_jobs = %s", total_number_jobs)
+            _LOG.debug("run_report.job_state_counts = %s", job_state_counts)
+        if total_number_jobs:
+            succeeded = job_state_counts.get(WmsStates.SUCCEEDED, 0)
+            if _LOG.isEnabledFor(logging.DEBUG):
+                _LOG.debug("succeeded = %s", succeeded)
+            percent_succeeded = f"{int(succeeded / total_number_jobs * 100)}"
+
+        return (
             run_flag,
-            run_report.state.name,
+            state.name,
             percent_succeeded,
             run_report.global_wms_id if use_global_id else run_report.wms_id,
-            run_report.operator,
-            run_report.project,
-            run_report.campaign,
-            run_report.payload,
-            run_report.run,
+            *_SUMMARY_DESCRIPTION_ATTRS(run_report),
         )
-        self._table.add_row(row)
 
 
 class DetailedRunReport(BaseRunReport):
@@ -182,21 +291,18 @@ class DetailedRunReport(BaseRunReport):
         # Docstring inherited from the base class.
 
         # If run summary exists, use it to get the reference job counts.
-        by_label_expected = {}
-        if run_report.run_summary:
-            for part in run_report.run_summary.split(";"):
-                label, count = part.split(":")
-                by_label_expected[label] = int(count)
+        by_label_expected = _parse_run_summary(run_report.run_summary)
 
-        total = ["TOTAL"]
-        total.extend([run_report.job_state_counts[state] for state in WmsStates])
-        total.append(sum(by_label_expected.values()) if by_label_expected else run_report.total_number_jobs)
-        self._table.add_row(total)
+        total_counts = [run_report.job_state_counts[state] for state in _WMS_STATES]
+        total_expected = (
+            sum(by_label_expected.values()) if by_label_expected else run_report.total_number_jobs
+        )
 
         job_summary = run_report.job_summary
         if job_summary is None:
             id_ = run_report.global_wms_id if use_global_id else run_report.wms_id
             self._msg = f"WARNING: Job summary for run '{id_}' not available, report maybe incomplete."
+            self._add_rows([("TOTAL", *total_counts, total_expected)])
             return
 
         if by_label_expected:
@@ -204,27 +310,39 @@ class DetailedRunReport(BaseRunReport):
         else:
             job_order = sorted(job_summary)
             self._msg = "WARNING: Could not determine order of pipeline, instead sorted alphabetically."
+
+        # Gather the job counts in an array with a row for the totals followed
+        # by a row per label, and a column per state.
+        rows = [total_counts]
         for label in job_order:
             try:
-                counts = job_summary[label]
+                label_counts = job_summary[label]
             except KeyError:
-                counts = dict.fromkeys(WmsStates, -1)
+                rows.append(_MISSING_COUNTS)
             else:
-                if label in by_label_expected:
-                    already_counted = sum(counts.values())
-                    if already_counted != by_label_expected[label]:
-                        counts[WmsStates.UNREADY] += by_label_expected[label] - already_counted
+                rows.append([label_counts[state] for state in _WMS_STATES])
+        counts = np.array(rows, dtype=np.int64)
 
-            run = [label]
-            run.extend([counts[state] for state in WmsStates])
-            run.append(by_label_expected[label] if by_label_expected else -1)
-            self._table.add_row(run)
+        expected = np.empty(len(rows), dtype=np.int64)
+        expected[0] = total_expected
+        if by_label_expected:
+            expected[1:] = list(by_label_expected.values())
+
+            # Jobs not accounted for in the job summary are considered as not
+            # ready yet. The adjustment is made on the copied counts so the job
+            # summary of the run is left intact.
+            known = np.array([False] + [label in job_summary for label in job_order])
+            counts[known, _UNREADY_INDEX] += (expected - counts.sum(axis=1))[known]
+        else:
+            expected[1:] = -1
+
+        self._add_columns([["TOTAL", *job_order], *counts.T, expected])
 
     def __str__(self):
         alignments = ["<"] + [">"] * (len(self._table.colnames) - 1)
-        lines = list(self._table.pformat_all(align=alignments))
+        lines = self._table.pformat_all(align=alignments)
         lines.insert(3, lines[1])
-        return str("\n".join(lines))
+        return "\n".join(lines)
 
 
 class ExitCodesReport(BaseRunReport):
@@ -237,12 +355,11 @@ class ExitCodesReport(BaseRunReport):
 
         # Use label ordering from the run summary as it should reflect
         # the ordering of the pipetasks in the pipeline.
+        # Only the labels are needed here, so the job counts are not parsed.
         labels = []
         if run_report.run_summary:
-            for part in run_report.run_summary.split(";"):
-                label, _ = part.split(":")
-                labels.append(label)
-        else:
+            labels = [part.partition(":")[0] for part in run_report.run_summary.split(";")]
+        if not labels:
             id_ = run_report.global_wms_id if use_global_id else run_report.wms_id
             self._msg = f"WARNING: Job summary for run '{id_}' not available, report maybe incomplete."
             return
@@ -253,28 +370,27 @@ class ExitCodesReport(BaseRunReport):
         pyld_error_codes = {1, 2}
 
         exit_code_summary = run_report.exit_code_summary
+        rows = []
         for label in labels:
-            exit_codes = exit_code_summary[label]
+            exit_code_counts = Counter(exit_code_summary[label])
 
-            pyld_errors = [code for code in exit_codes if code in pyld_error_codes]
-            pyld_error_count = len(pyld_errors)
-            pyld_error_summary = (
-                ", ".join(sorted(str(code) for code in set(pyld_errors))) if pyld_errors else "None"
-            )
+            # Sort the distinct codes as integers so they are listed in
+            # numerical order.
+            pyld_errors = sorted(code for code in exit_code_counts if code in pyld_error_codes)
+            pyld_error_count = sum(exit_code_counts[code] for code in pyld_errors)
+            pyld_error_summary = ", ".join(str(code) for code in pyld_errors) if pyld_errors else "None"
 
-            infra_errors = [code for code in exit_codes if code not in pyld_error_codes]
-            infra_error_count = len(infra_errors)
-            infra_error_summary = (
-                ", ".join(sorted(str(code) for code in set(infra_errors))) if infra_errors else "None"
-            )
+            infra_errors = sorted(code for code in exit_code_counts if code not in pyld_error_codes)
+            infra_error_count = sum(exit_code_counts[code] for code in infra_errors)
+            infra_error_summary = ", ".join(str(code) for code in infra_errors) if infra_errors else "None"
 
             run = [label, pyld_error_count, pyld_error_summary, infra_error_count, infra_error_summary]
-            self._table.add_row(run)
+            rows.append(run)
+        self._add_rows(rows)
 
     def __str__(self):
         alignments = ["<"] + [">"] * (len(self._table.colnames) - 1)
-        lines = list(self._table.pformat_all(align=alignments))
-        return str("\n".join(lines))
+        return "\n".join(self._table.pformat_all(align=alignments))
 
 
 def compile_job_summary(report: WmsRunReport) -> None:
@@ -301,12 +417,10 @@ def compile_job_summary(report: WmsRunReport) -> None:
     if not report.jobs:
         raise ValueError("job summary cannot be compiled: information about individual jobs not available.")
     job_summary = {}
-    by_label = group_jobs_by_label(report.jobs)
-    for label, job_group in by_label.items():
-        by_label_state = group_jobs_by_state(job_group)
-        _LOG.debug("by_label_state = %s", by_label_state)
-        counts = {state: len(jobs) for state, jobs in by_label_state.items()}
-        job_summary[label] = counts
+    by_label_state = Counter((job.label, job.state) for job in report.jobs)
+    for (label, state), count in by_label_state.items():
+        counts = job_summary.setdefault(label, dict.fromkeys(_WMS_STATES, 0))
+        counts[state] = count
     report.job_summary = job_summary
 
 
@@ -323,8 +437,9 @@ def group_jobs_by_state(jobs):
     by_state : `dict`
         Mapping of job state to a list of jobs.
     """
-    _LOG.debug("group_jobs_by_state: jobs=%s", jobs)
-    by_state = {state: [] for state in WmsStates}
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("group_jobs_by_state: jobs=%s", jobs)
+    by_state = {state: [] for state in _WMS_STATES}
     for job in jobs:
         by_state[job.state].append(job)
     return by_state
@@ -348,3 +463,28 @@ def group_jobs_by_label(jobs):
         group = by_label.setdefault(job.label, [])
         group.append(job)
     return by_label
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_run_summary(run_summary):
+    """Parse the run summary into expected job counts per label.
+
+    Parameters
+    ----------
+    run_summary : `str` | None
+        Run summary, i.e., a string like ``"label1:count1;label2:count2"``.
+
+    Returns
+    -------
+    by_label : `~types.MappingProxyType` [`str`, `int`]
+        Read-only mapping of job label to the expected number of jobs. The
+        mapping preserves the label order from the summary and is empty if
+        no summary was provided. It is read-only as the result is cached
+        and shared between the callers.
+    """
+    by_label = {}
+    if run_summary:
+        for part in run_summary.split(";"):
+            label, _, count = part.partition(":")
+            by_label[label] = int(count)
+    return MappingProxyType(by_label)
@@ -106,39 +106,44 @@ def display_report(
         fields = [(" ", "S")] + [(state.name, "i") for state in WmsStates] + [("EXPECTED", "i")]
         run_report = DetailedRunReport(fields)
 
+        if return_exit_codes:
+            fields = [
+                (" ", "S"),
+                ("PAYLOAD ERROR COUNT", "i"),
+                ("PAYLOAD ERROR CODES", "S"),
+                ("INFRASTRUCTURE ERROR COUNT", "i"),
+                ("INFRASTRUCTURE ERROR CODES", "S"),
+            ]
+            run_exits_report = ExitCodesReport(fields)
+
         for run in runs:
             run_brief.add(run, use_global_id=is_global)
 
             run_report.add(run, use_global_id=is_global)
-            if run_report.message:
-                print(run_report.message, file=file)
 
-            print(run_brief, file=file)
-            print("\n", file=file)
-            print(f"Path: {run.path}", file=file)
-            print(f"Global job id: {run.global_wms_id}", file=file)
-            print("\n", file=file)
-            print(run_report, file=file)
+            # Assemble the entire report for the run before writing it out.
+            parts = [
+                str(run_brief),
+                "\n",
+                f"Path: {run.path}",
+                f"Global job id: {run.global_wms_id}",
+                "\n",
+                str(run_report),
+            ]
+            if run_report.message:
+                parts.insert(0, run_report.message)
 
             if return_exit_codes:
-                fields = [
-                    (" ", "S"),
-                    ("PAYLOAD ERROR COUNT", "i"),
-                    ("PAYLOAD ERROR CODES", "S"),
-                    ("INFRASTRUCTURE ERROR COUNT", "i"),
-                    ("INFRASTRUCTURE ERROR CODES", "S"),
-                ]
-                run_exits_report = ExitCodesReport(fields)
                 run_exits_report.add(run, use_global_id=is_global)
-                print("\n", file=file)
-                print(run_exits_report, file=file)
+                parts.extend(["\n", str(run_exits_report)])
                 run_exits_report.clear()
 
+            file.write("\n".join(parts) + "\n")
+
             run_brief.clear()
             run_report.clear()
     else:
-        for run in runs:
-            run_brief.add(run, use_global_id=is_global)
+        run_brief.add_many(runs, use_global_id=is_global)
         run_brief.sort("ID")
         print(run_brief, file=file)
 
@@ -27,8 +27,10 @@
 
 """Tests for reporting mechanism."""
 
+import copy
 import dataclasses
 import io
+import textwrap
 import unittest
 
 from astropy.table import Table
@@ -42,10 +44,17 @@ from lsst.ctrl.bps import (
     WmsStates,
     compile_job_summary,
 )
-from lsst.ctrl.bps.report import retrieve_report
+from lsst.ctrl.bps.report import display_report, retrieve_report
 from wms_test_utils import TEST_REPORT
 
 
+def _get_buffer_owner(array):
+    """Find the array owning the memory the given array uses."""
+    while getattr(array, "base", None) is not None:
+        array = array.base
+    return array
+
+
 class FakeRunReport(BaseRunReport):
     """A fake run report."""
 
@@ -77,14 +86,61 @@ class FakeRunReportTestCase(unittest.TestCase):
         other.add(WmsRunReport(wms_id="1.0", state=WmsStates.FAILED))
         self.assertNotEqual(self.report, other)
 
+    def testInequalityValues(self):
+        """Test if reports with different entries are not identical."""
+        other = FakeRunReport(self.fields)
+        other.add(WmsRunReport(wms_id="2.0", state=WmsStates.RUNNING))
+        other.add(WmsRunReport(wms_id="1.0", state=WmsStates.FAILED))
+        self.assertNotEqual(self.report, other)
+
+    def testInequalityColumns(self):
+        """Test if reports with different columns are not identical."""
+        other = FakeRunReport([("ID", "S"), ("STATUS", "S")])
+        other.add(WmsRunReport(wms_id="2.0", state=WmsStates.RUNNING))
+        other.add(WmsRunReport(wms_id="1.0", state=WmsStates.SUCCEEDED))
+        self.assertNotEqual(self.report, other)
+
     def testLength(self):
         self.assertEqual(len(self.report), 2)
 
+    def testAddMany(self):
+        """Test adding multiple runs at once."""
+        other = FakeRunReport(self.fields)
+        other.add_many(
+            [
+                WmsRunReport(wms_id="2.0", state=WmsStates.RUNNING),
+                WmsRunReport(wms_id="1.0", state=WmsStates.SUCCEEDED),
+            ]
+        )
+        self.assertEqual(self.report, other)
+
     def testClear(self):
         """Test clearing the report."""
+        old_columns = list(self.report._table.itercols())
         self.report.clear()
         self.assertEqual(len(self.report), 0)
 
+        # Check if the cleared report no longer holds the old entries. As the
+        # columns are empty, compare the buffers they were created from.
+        for old_column, column in zip(old_columns, self.report._table.itercols(), strict=True):
+            self.assertIsNot(_get_buffer_owner(column), _get_buffer_owner(old_column))
+
+        # Check if the cleared report can be reused.
+        self.report.add(WmsRunReport(wms_id="3.0", state=WmsStates.FAILED))
+        expected = FakeRunReport(self.fields)
+        expected.add(WmsRunReport(wms_id="3.0", state=WmsStates.FAILED))
+        self.assertEqual(self.report, expected)
+
+        # Check if column formats and table metadata survive clearing.
+        table = Table(dtype=self.fields, meta={"foo": "bar"})
+        table["STATE"].format = "[{}]"
+        report = FakeRunReport.from_table(table)
+        report.add(WmsRunReport(wms_id="1.0", state=WmsStates.SUCCEEDED))
+        report.clear()
+        report.add(WmsRunReport(wms_id="2.0", state=WmsStates.RUNNING))
+        self.assertIn("[RUNNING]", str(report))
+        self.assertEqual(report._table.meta, {"foo": "bar"})
+
     def testSortWithKnownKey(self):
         """Test sorting the report using known column."""
         expected_output = io.StringIO()
@@ -163,6 +219,31 @@ class SummaryRunReportTestCase(unittest.TestCase):
 
         self.assertEqual(self.actual_output.getvalue(), self.expected_output.getvalue())
 
+    def testAddMany(self):
+        """Test adding multiple runs at once."""
+        self.expected.add_row(["", "RUNNING", "50", "2.0", "tester", "dev", "testing", "test", "run"])
+        print("\n".join(self.expected.pformat_all()), file=self.expected_output)
+
+        other = dataclasses.replace(self.run, wms_id="2.0")
+        self.report.add_many([self.run, other])
+        print(self.report, file=self.actual_output)
+
+        self.assertEqual(self.actual_output.getvalue(), self.expected_output.getvalue())
+
+    def testAddSameAsAddMany(self):
+        """Test if adding runs one by one and at once gives the same report."""
+        runs = [
+            self.run,
+            dataclasses.replace(self.run, wms_id="2.0", operator=None),
+            dataclasses.replace(self.run, wms_id=123),
+        ]
+        for run in runs:
+            self.report.add(run)
+        other = SummaryRunReport(self.fields)
+        other.add_many(runs)
+        self.assertEqual(self.report, other)
+        self.assertEqual(str(self.report), str(other))
+
     def testAddWithFailedFlag(self):
         """Test adding a run with a failed job."""
         self.expected["X"][0] = "F"
@@ -257,6 +338,54 @@ class DetailedRunReportTestCase(unittest.TestCase):
 
         self.assertEqual(self.actual, self.expected)
 
+    def testAddWithUnaccountedJobs(self):
+        """Test adding a run with jobs missing from its job summary."""
+        table = Table(dtype=self.fields)
+        table.add_row(
+            ["TOTAL"]
+            + [1 if state in {WmsStates.RUNNING, WmsStates.SUCCEEDED} else 0 for state in WmsStates]
+            + [3]
+        )
+        table.add_row(
+            ["foo"]
+            + [1 if state in {WmsStates.UNREADY, WmsStates.SUCCEEDED} else 0 for state in WmsStates]
+            + [2]
+        )
+        table.add_row(["bar"] + [1 if state == WmsStates.RUNNING else 0 for state in WmsStates] + [1])
+        expected = DetailedRunReport.from_table(table)
+
+        self.run.jobs = None
+        self.run.run_summary = "foo:2;bar:1"
+        job_summary = copy.deepcopy(self.run.job_summary)
+        self.actual.add(self.run)
+
+        self.assertEqual(self.actual, expected)
+        self.assertEqual(self.run.job_summary, job_summary)
+
+    def testAddWithMissingLabel(self):
+        """Test adding a run with a label missing from its job summary."""
+        # Unsigned integers can't hold the placeholders used for missing
+        # job counts.
+        fields = [("", "S")] + [(state.name, "i") for state in WmsStates] + [("EXPECTED", "i")]
+
+        table = Table(dtype=fields)
+        table.add_row(
+            ["TOTAL"]
+            + [1 if state in {WmsStates.RUNNING, WmsStates.SUCCEEDED} else 0 for state in WmsStates]
+            + [3]
+        )
+        table.add_row(["foo"] + [1 if state == WmsStates.SUCCEEDED else 0 for state in WmsStates] + [1])
+        table.add_row(["bar"] + [1 if state == WmsStates.RUNNING else 0 for state in WmsStates] + [1])
+        table.add_row(["baz"] + [-1 for _ in WmsStates] + [1])
+        expected = DetailedRunReport.from_table(table)
+
+        self.run.jobs = None
+        self.run.run_summary = "foo:1;bar:1;baz:1"
+        actual = DetailedRunReport(fields)
+        actual.add(self.run)
+
+        self.assertEqual(actual, expected)
+
     def testAddWithoutJobSummary(self):
         """Test adding a run without either a job summary or job info."""
         self.run.jobs = None
@@ -346,6 +475,40 @@ class ExitCodesReportTestCase(unittest.TestCase):
         self.actual.add(self.run)
         self.assertEqual(self.actual, self.expected)
 
+    def testAddToFormattedReport(self):
+        """Test if column formats and metadata survive adding a run."""
+        table = Table(dtype=self.fields, meta={"foo": "bar"})
+        table["PAYLOAD ERROR COUNT"].format = "{:05d}"
+        table["PAYLOAD ERROR COUNT"].description = "Number of payload errors"
+        actual = ExitCodesReport.from_table(table)
+        actual.add(self.run)
+
+        table.add_row(["foo", 0, "None", 0, "None"])
+        table.add_row(["bar", 2, "1, 2", 2, "3, 4"])
+        expected = ExitCodesReport.from_table(table)
+
+        self.assertEqual(str(actual), str(expected))
+        self.assertIn("00002", str(actual))
+        self.assertEqual(actual._table.meta, {"foo": "bar"})
+        self.assertEqual(actual._table["PAYLOAD ERROR COUNT"].description, "Number of payload errors")
+
+    def testAddWithoutJobCounts(self):
+        """Test adding a run with job counts missing from its run summary."""
+        self.run.run_summary = "foo:;bar:unknown"
+        self.actual.add(self.run)
+        self.assertEqual(self.actual, self.expected)
+
+    def testAddWithRepeatedCodes(self):
+        """Test if repeated codes are counted and listed in numerical order."""
+        table = Table(dtype=self.fields)
+        table.add_row(["foo", 0, "None", 0, "None"])
+        table.add_row(["bar", 3, "1, 2", 4, "3, 10, 255"])
+        expected = ExitCodesReport.from_table(table)
+
+        self.run.exit_code_summary["bar"] = [255, 1, 10, 2, 3, 1, 10]
+        self.actual.add(self.run)
+        self.assertEqual(self.actual, expected)
+
     def testAddWithoutRunSummary(self):
         """Test adding a run without a run summary."""
         self.run.run_summary = None
@@ -381,6 +544,28 @@ class CompileJobSummaryTestCase(unittest.TestCase):
         compile_job_summary(result)
         self.assertEqual(result, self.report)
 
+    def testSummaryMultipleLabels(self):
+        """Test if jobs are counted per label and state."""
+        result = dataclasses.replace(self.report)
+        result.job_summary = None
+        result.jobs = [
+            WmsJobReport(wms_id="1.0", name="", label="foo", state=WmsStates.SUCCEEDED),
+            WmsJobReport(wms_id="2.0", name="", label="bar", state=WmsStates.FAILED),
+            WmsJobReport(wms_id="3.0", name="", label="foo", state=WmsStates.SUCCEEDED),
+            WmsJobReport(wms_id="4.0", name="", label="foo", state=WmsStates.RUNNING),
+        ]
+        compile_job_summary(result)
+
+        expected = {
+            "foo": {
+                state: 2 if state == WmsStates.SUCCEEDED else 1 if state == WmsStates.RUNNING else 0
+                for state in WmsStates
+            },
+            "bar": {state: 1 if state == WmsStates.FAILED else 0 for state in WmsStates},
+        }
+        self.assertEqual(result.job_summary, expected)
+        self.assertEqual(list(result.job_summary), ["foo", "bar"])
+
     def testCompilationError(self):
         """Test if error is raised if the summary cannot be compiled."""
         self.report.job_summary = None
@@ -389,6 +574,80 @@ class CompileJobSummaryTestCase(unittest.TestCase):
             compile_job_summary(self.report)
 
 
+class DisplayReportTestCase(unittest.TestCase):
+    """Test displaying reports."""
+
+    def setUp(self):
+        self.report = dataclasses.replace(TEST_REPORT)
+
+    def testDetailedReport(self):
+        """Test if all parts of a detailed report are displayed."""
+        self.report.run_summary = None
+        self.report.state = WmsStates.FAILED
+        self.report.job_summary = {
+            "foo": {state: 1 if state == WmsStates.FAILED else 0 for state in WmsStates},
+        }
+        self.report.exit_code_summary = {"foo": [1]}
+
+        expected = textwrap.dedent(
+            """\
+            WARNING: Could not determine order of pipeline, instead sorted alphabetically.
+             X  STATE   %S  ID OPERATOR PROJECT CAMPAIGN PAYLOAD RUN
+            --- ------ --- --- -------- ------- -------- ------- ---
+                FAILED 100 1.0   tester     dev  testing    test run
+
+
+            Path: /path/to/run
+            Global job id: foo#1.0
+
+
+                  UNKNOWN MISFIT UNREADY READY PENDING RUNNING DELETED HELD SUCCEEDED FAILED PRUNED EXPECTED
+            ----- ------- ------ ------- ----- ------- ------- ------- ---- --------- ------ ------ --------
+            TOTAL       0      0       0     0       0       0       0    0         1      0      0        1
+            ----- ------- ------ ------- ----- ------- ------- ------- ---- --------- ------ ------ --------
+            foo         0      0       0     0       0       0       0    0         0      1      0       -1
+
+
+                PAYLOAD ERROR COUNT PAYLOAD ERROR CODES INFRASTRUCTURE ERROR COUNT INFRASTRUCTURE ERROR CODES
+            --- ------------------- ------------------- -------------------------- --------------------------
+            """
+        )
+
+        output = io.StringIO()
+        display_report([self.report], [], is_detailed=True, return_exit_codes=True, file=output)
+        self.assertEqual(output.getvalue(), expected)
+        output.close()
+
+    def testDetailedReportWithExitCodesForManyRuns(self):
+        """Test if exit codes of each run are displayed only once."""
+        first = dataclasses.replace(
+            self.report,
+            run_summary="task_a:1",
+            job_summary={"task_a": {state: 1 if state == WmsStates.FAILED else 0 for state in WmsStates}},
+            exit_code_summary={"task_a": [1]},
+        )
+        second = dataclasses.replace(
+            self.report,
+            wms_id="2.0",
+            path="/path/to/other/run",
+            run_summary="task_b:1",
+            job_summary={"task_b": {state: 1 if state == WmsStates.FAILED else 0 for state in WmsStates}},
+            exit_code_summary={"task_b": [3]},
+        )
+
+        output = io.StringIO()
+        display_report([first, second], [], is_detailed=True, return_exit_codes=True, file=output)
+        lines = output.getvalue().split("\n")
+        output.close()
+
+        start = lines.index("Path: /path/to/other/run")
+        first_lines, second_lines = lines[:start], lines[start:]
+        self.assertEqual(len([line for line in first_lines if line.startswith("task_a")]), 2)
+        self.assertFalse([line for line in first_lines if line.startswith("task_b")])
+        self.assertEqual(len([line for line in second_lines if line.startswith("task_b")]), 2)
+        self.assertFalse([line for line in second_lines if line.startswith("task_a")])
+
+
 class RetrieveReportTestCase(unittest.TestCase):
     """Test report retrieval."""
 